@@ -1,18 +1,234 @@
-from typing import List
+import heapq
+import mmap
+from array import array
+from bisect import bisect_right
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 class Elf:
     def __init__(self):
         self.inventory = []
+        self.total = 0
 
     def add(self, item: int):
         self.inventory.append(item)
+        self.total += item
 
     def get_total(self):
-        total = 0
-        for item in self.inventory:
-            total += item
+        return self.total
+
+class ElfInventory:
+    """ Compressed-sparse-row store for many elves.  Every item lives in one flat array('q'), and
+    elf i owns items[offsets[i]:offsets[i + 1]] with its total precomputed in totals[i] """
+    def __init__(self):
+        self.items = array("q")
+        self.offsets = array("q", [0])
+        self.totals = array("q")
+        self._sorted_totals = None
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "ElfInventory":
+        inventory = cls()
+        for line in lines:
+            if line.strip():
+                inventory.items.append(int(line))
+            else:
+                inventory.end_elf()
+        inventory.end_elf()
+        return inventory
+
+    def end_elf(self):
+        """ Close off the items added since the last elf, empty elves are skipped """
+        start = self.offsets[-1]
+        if len(self.items) == start:
+            return
+        self.offsets.append(len(self.items))
+        self.totals.append(sum(self.items[start:]))
+        self._sorted_totals = None
+
+    def add_elf(self, items: Iterable[int]):
+        self.items.extend(items)
+        self.end_elf()
+
+    def get_items(self, elf: int) -> array:
+        return self.items[self.offsets[elf]:self.offsets[elf + 1]]
+
+    def get_total(self, elf: int) -> int:
+        return self.totals[elf]
+
+    def get_sorted_totals(self) -> array:
+        """ Ascending totals, rebuilt lazily after new elves are added """
+        if self._sorted_totals is None:
+            self._sorted_totals = array("q", sorted(self.totals))
+        return self._sorted_totals
+
+    def rank(self, elf: int) -> int:
+        """ 1 is the heaviest elf, ties share the best rank """
+        sorted_totals = self.get_sorted_totals()
+        return len(sorted_totals) - bisect_right(sorted_totals, self.totals[elf]) + 1
+
+    def percentile(self, elf: int) -> float:
+        """ Percentage of elves carrying no more than this elf """
+        sorted_totals = self.get_sorted_totals()
+        return 100 * bisect_right(sorted_totals, self.totals[elf]) / len(sorted_totals)
+
+    def total_at_percentile(self, percent: float) -> int:
+        """ Nearest-rank percentile of all elf totals """
+        if not 0 <= percent <= 100:
+            raise ValueError(f"Percentile must be within [0, 100], got {percent}")
+        sorted_totals = self.get_sorted_totals()
+        index = max(0, -(-len(sorted_totals) * percent // 100) - 1)
+        return sorted_totals[int(index)]
+
+    def __len__(self):
+        return len(self.totals)
+
+class HeaviestElves:
+    """ Streaming top-K of elf totals.  Backed by a bounded min-heap, so the lightest of the
+    kept elves is always at heap[0] and each new elf costs at most O(log K) """
+    def __init__(self, num_to_keep: int=3):
+        if num_to_keep < 1:
+            raise ValueError(f"Must keep at least one elf, got {num_to_keep}")
+        self.num_to_keep = num_to_keep
+        self.heap: List[int] = []
+
+    def add(self, total: int):
+        if len(self.heap) < self.num_to_keep:
+            heapq.heappush(self.heap, total)
+        elif total > self.heap[0]: # Heavier than the lightest fat elf
+            heapq.heapreplace(self.heap, total)
+
+    def update(self, totals: Iterable[int]):
+        for total in totals:
+            self.add(total)
+
+    def get_totals(self) -> List[int]:
+        """ Totals seen so far, heaviest first """
+        return sorted(self.heap, reverse=True)
+
+    def get_sum(self) -> int:
+        return sum(self.heap)
 
-        return total
+    def __len__(self):
+        return len(self.heap)
+
+def stream_elf_totals(lines: Iterable[str]) -> Iterator[int]:
+    """ Yield each elf's total as soon as its blank-line separator (or EOF) is reached """
+    total = 0
+    items = 0
+    for line in lines:
+        if line.strip():
+            total += int(line)
+            items += 1
+        elif items:
+            yield total
+            total = 0
+            items = 0
+    if items:
+        yield total
+
+WHITESPACE = np.frombuffer(b" \t\r\n\v\f", dtype=np.uint8)
+
+def load_elf_totals(filename: str) -> np.ndarray:
+    """ Vectorized loader, every elf's total from one read of the raw bytes and segmented
+    reductions.  No Elf objects, per-elf lists or per-line strings are created """
+    raw = np.fromfile(filename, dtype=np.uint8)
+    is_digit = (raw >= ord("0")) & (raw <= ord("9"))
+
+    # Anything int() would refuse must not be quietly skipped, so only whitespace may sit between
+    # digits and each line may hold a single number
+    invalid = np.flatnonzero(~(is_digit | np.isin(raw, WHITESPACE)))
+    if invalid.size:
+        raise ValueError(f"Invalid byte {bytes(raw[invalid[:1]])!r} at offset {invalid[0]} of {filename}")
+    all_line_ids = np.cumsum(raw == ord("\n"))
+    run_starts = np.flatnonzero(is_digit & ~np.concatenate(([False], is_digit[:-1])))
+    repeated = np.flatnonzero(np.diff(all_line_ids[run_starts]) == 0)
+    if repeated.size:
+        raise ValueError(f"More than one number on line {all_line_ids[run_starts[repeated[0]]] + 1} of {filename}")
+
+    digit_pos = np.flatnonzero(is_digit)
+    if digit_pos.size == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # Line number of every digit, digits of one line are contiguous in digit_pos
+    line_ids = all_line_ids[digit_pos]
+    line_starts = np.flatnonzero(np.diff(line_ids, prepend=-1))
+    line_lengths = np.diff(line_starts, append=digit_pos.size)
+
+    # Weight each digit by its place value, then reduce each line to its number
+    place = np.repeat(line_starts + line_lengths, line_lengths) - np.arange(digit_pos.size) - 1
+    digits = (raw[digit_pos] - ord("0")).astype(np.int64) * (10 ** place)
+    values = np.add.reduceat(digits, line_starts)
+
+    # A skipped line number is a blank-line separator, and starts a new elf
+    value_lines = line_ids[line_starts]
+    elf_starts = np.flatnonzero(np.diff(value_lines, prepend=-2) > 1)
+    return np.add.reduceat(values, elf_starts)
+
+def heaviest_totals(totals: np.ndarray, num_to_keep: int=3) -> np.ndarray:
+    """ Top-K of an array of totals via argpartition, heaviest first """
+    if num_to_keep < 1:
+        raise ValueError(f"Must keep at least one elf, got {num_to_keep}")
+    if num_to_keep < totals.size:
+        totals = totals[np.argpartition(totals, -num_to_keep)[-num_to_keep:]]
+    return np.sort(totals)[::-1]
+
+ELF_SEPARATOR = re.compile(rb"\n[ \t\r]*\n")
+
+def split_on_elves(buf, num_chunks: int) -> List[Tuple[int, int]]:
+    """ Split buf into about num_chunks byte ranges, each ending just after a blank line so
+    no elf is ever cut in half """
+    ranges = []
+    chunk_size = max(1, len(buf) // num_chunks)
+    start = 0
+    while start < len(buf):
+        separator = ELF_SEPARATOR.search(buf, start + chunk_size)
+        end = separator.end() if separator else len(buf)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+def iter_lines(buf, start: int, end: int) -> Iterator[bytes]:
+    """ Lines of buf[start:end] one at a time, found in place so the range is never copied whole """
+    while start < end:
+        newline = buf.find(b"\n", start, end)
+        if newline == -1:
+            newline = end
+        yield buf[start:newline]
+        start = newline + 1
+
+def heaviest_in_range(filename: str, start: int, end: int, num_to_keep: int) -> List[int]:
+    """ Process pool worker, reduce one elf-aligned byte range to its local top-K heap """
+    heaviest_elves = HeaviestElves(num_to_keep)
+    with open(filename, "rb") as datafile:
+        with mmap.mmap(datafile.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            heaviest_elves.update(stream_elf_totals(iter_lines(buf, start, end)))
+    return heaviest_elves.heap
+
+def parallel_heaviest(filename: str, num_to_keep: int=3, workers: Optional[int]=None,
+                      num_chunks: Optional[int]=None) -> HeaviestElves:
+    """ Top-K over a memory-mapped file, reduced in elf-aligned chunks by a process pool and
+    merged at the end """
+    workers = workers or os.cpu_count() or 1
+    num_chunks = num_chunks or workers * 4
+    heaviest_elves = HeaviestElves(num_to_keep)
+    if os.path.getsize(filename) == 0:
+        return heaviest_elves
+
+    with open(filename, "rb") as datafile:
+        with mmap.mmap(datafile.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            ranges = split_on_elves(buf, num_chunks)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(heaviest_in_range, filename, start, end, num_to_keep)
+                   for start, end in ranges]
+        for future in futures:
+            heaviest_elves.update(future.result())
+    return heaviest_elves
 
 def sorting_func(elf: Elf):
     return elf.get_total()
@@ -25,25 +241,13 @@ def keep_heaviest_elves(elves: List[Elf], new_elf: Elf, num_to_keep: int=3):
         elves.sort(key=sorting_func)
 
 
-elf_list = [Elf(), Elf(), Elf()]
+if __name__ == "__main__":
+    heaviest_elves = HeaviestElves(3)
+    with open("Day1Data.txt", "r") as datafile:
+        heaviest_elves.update(stream_elf_totals(datafile))
 
-heaviest_elf = Elf()
-this_elf = Elf()
-with open("Day1Data.txt", "r") as datafile:
-    for line in datafile:
-        if line.strip():
-            this_elf.add(int(line))
-        else: # Empty line, do elf comparisons
-            keep_heaviest_elves(elf_list, this_elf, 3)
-            #if this_elf.get_total() > heaviest_elf.get_total():
-            #    heaviest_elf = this_elf
-            this_elf = Elf()
-
-print("Heaviest Elves are:")
-sum = 0
-for elf in elf_list:
-    #print(elf.inventory)
-    print(elf.get_total())
-    sum += elf.get_total()
-print(f"Total sum is: {sum}")
-print(f"Elves in list is {len(elf_list)}")
\ No newline at end of file
+    print("Heaviest Elves are:")
+    for total in heaviest_elves.get_totals():
+        print(total)
+    print(f"Total sum is: {heaviest_elves.get_sum()}")
+    print(f"Elves in list is {len(heaviest_elves)}")
@@ -0,0 +1,51 @@
+""" Compare the Elf/keep_heaviest_elves loop against the vectorized and parallel paths on 100x the puzzle input.
+Run from this directory: python bench_day_1.py """
+import os
+import tempfile
+import time
+
+from Day1 import Elf, keep_heaviest_elves, load_elf_totals, heaviest_totals, parallel_heaviest
+
+SCALE = 100
+
+def elf_loop(filename: str) -> int:
+    elf_list = [Elf(), Elf(), Elf()]
+    this_elf = Elf()
+    with open(filename, "r") as datafile:
+        for line in datafile:
+            if line.strip():
+                this_elf.add(int(line))
+            else:
+                keep_heaviest_elves(elf_list, this_elf, 3)
+                this_elf = Elf()
+    keep_heaviest_elves(elf_list, this_elf, 3)
+    return sum(elf.get_total() for elf in elf_list)
+
+def vectorized(filename: str) -> int:
+    return int(heaviest_totals(load_elf_totals(filename), 3).sum())
+
+def parallel(filename: str) -> int:
+    return parallel_heaviest(filename, 3).get_sum()
+
+def time_it(func, filename: str) -> float:
+    start_time = time.perf_counter()
+    result = func(filename)
+    end_time = time.perf_counter()
+    print(f"{func.__name__:>12}: {result} in {(end_time - start_time):.3f}s")
+    return end_time - start_time
+
+if __name__ == "__main__":
+    with open("Day1Data.txt", "r") as datafile:
+        puzzle = datafile.read().rstrip("\n")
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as bigfile:
+        bigfile.write("\n\n".join([puzzle] * SCALE))
+    try:
+        print(f"Input is {SCALE}x the puzzle, {os.path.getsize(bigfile.name)} bytes")
+        loop_time = time_it(elf_loop, bigfile.name)
+        vector_time = time_it(vectorized, bigfile.name)
+        parallel_time = time_it(parallel, bigfile.name)
+        print(f"Vectorized speedup: {loop_time / vector_time:.1f}x")
+        print(f"Parallel speedup ({os.cpu_count()} cores): {loop_time / parallel_time:.1f}x")
+    finally:
+        os.remove(bigfile.name)
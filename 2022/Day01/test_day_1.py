@@ -0,0 +1,93 @@
+import pytest
+
+from Day01.Day1 import HeaviestElves, stream_elf_totals, load_elf_totals, heaviest_totals, parallel_heaviest, split_on_elves, ElfInventory, iter_lines
+
+def test_part_1():
+    print()
+    print("Part 1: How many total Calories is the heaviest elf carrying?")
+    heaviest_elves = HeaviestElves(1)
+    with open("2022/Day01/Day1Data.txt", "r") as datafile:
+        heaviest_elves.update(stream_elf_totals(datafile))
+
+    print(heaviest_elves.get_totals())
+    assert heaviest_elves.get_totals() == [69177]
+
+def test_part_2():
+    print()
+    print("Part 2: How many total Calories are the top three elves carrying?")
+    heaviest_elves = HeaviestElves(3)
+    with open("2022/Day01/Day1Data.txt", "r") as datafile:
+        heaviest_elves.update(stream_elf_totals(datafile))
+
+    print(heaviest_elves.get_totals())
+    assert heaviest_elves.get_totals() == [69177, 69171, 69108]
+    assert heaviest_elves.get_sum() == 207456
+
+def test_streaming_top_k():
+    lines = ["1000\n", "2000\n", "3000\n", "\n", "4000\n", "\n", "5000\n", "6000\n", "\n",
+             "7000\n", "8000\n", "9000\n", "\n", "10000"]
+    heaviest_elves = HeaviestElves(2)
+    for total in stream_elf_totals(lines):
+        heaviest_elves.add(total)
+        if total == 4000:
+            # Results are available part way through the stream
+            assert heaviest_elves.get_totals() == [6000, 4000]
+
+    assert heaviest_elves.get_totals() == [24000, 11000]
+    assert len(HeaviestElves(10)) == 0
+
+def test_vectorized_totals():
+    totals = load_elf_totals("2022/Day01/Day1Data.txt")
+    with open("2022/Day01/Day1Data.txt", "r") as datafile:
+        assert totals.tolist() == list(stream_elf_totals(datafile))
+
+    assert heaviest_totals(totals, 1).tolist() == [69177]
+    assert heaviest_totals(totals, 3).sum() == 207456
+    assert heaviest_totals(totals, totals.size + 5).size == totals.size
+
+def test_vectorized_rejects_bad_lines(tmp_path):
+    datafile = tmp_path / "elves.txt"
+    datafile.write_bytes(b"100\r\n12\r\n\r\n 7 \n")
+    assert load_elf_totals(str(datafile)).tolist() == [112, 7]
+
+    for data in [b"100\n12a\n", b"100\n\n5 5\n"]:
+        datafile.write_bytes(data)
+        with pytest.raises(ValueError):
+            load_elf_totals(str(datafile))
+
+def test_parallel_chunks():
+    with open("2022/Day01/Day1Data.txt", "rb") as datafile:
+        data = datafile.read()
+    ranges = split_on_elves(data, 7)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[:end].endswith(b"\n\n")
+
+    for start, end in ranges:
+        assert list(iter_lines(data, start, end)) == data[start:end].splitlines()
+    assert list(iter_lines(b"1\n2", 0, 3)) == [b"1", b"2"]
+
+    heaviest_elves = parallel_heaviest("2022/Day01/Day1Data.txt", 3, workers=2, num_chunks=7)
+    assert heaviest_elves.get_totals() == [69177, 69171, 69108]
+
+def test_inventory_store():
+    lines = ["1000\n", "2000\n", "3000\n", "\n", "4000\n", "\n", "5000\n", "6000\n", "\n",
+             "7000\n", "8000\n", "9000\n", "\n", "10000"]
+    inventory = ElfInventory.from_lines(lines)
+    assert len(inventory) == 5
+    assert inventory.get_items(2).tolist() == [5000, 6000]
+    assert inventory.get_total(3) == 24000
+    assert inventory.rank(3) == 1
+    assert inventory.rank(1) == 5
+    assert inventory.percentile(4) == 60
+    assert inventory.total_at_percentile(50) == 10000
+    assert inventory.total_at_percentile(100) == 24000
+
+    inventory.add_elf([30000])
+    assert inventory.rank(3) == 2
+
+    with open("2022/Day01/Day1Data.txt", "r") as datafile:
+        inventory = ElfInventory.from_lines(datafile)
+    assert inventory.total_at_percentile(100) == 69177
+    assert sum(inventory.get_items(0)) == inventory.get_total(0)
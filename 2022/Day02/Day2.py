@@ -1,3 +1,5 @@
+from typing import List, Tuple
+
 class Round:
     def __init__(self, opponent_move: str, suggested_move: str, part2: bool = False):
         if opponent_move not in ["A", "B", "C"] or suggested_move not in ["X", "Y", "Z"]:
@@ -53,18 +55,51 @@ class Round:
                 print("Code not found")
         return ret_val
 
-print("Part 1:")
-total_score = 0
-with open("Day2Data.txt", "r") as datafile:
-    for line in datafile:
-        col1, col2 = line.split()
-        total_score += Round(col1, col2).score()
-print(total_score)
+# Every possible strategy guide line, tables below are indexed the same way
+LINE_TYPES = [f"{opponent} {suggested}" for opponent in "ABC" for suggested in "XYZ"]
+PART1_SCORES = [Round(*line_type.split()).score() for line_type in LINE_TYPES]
+PART2_SCORES = [Round(*line_type.split(), part2=True).score() for line_type in LINE_TYPES]
+
+CHUNK_SIZE = 1 << 24
+
+def count_line_types(filename: str) -> List[int]:
+    """ Histogram of the 9 line types, counted with bytes.count over large blocks of the guide.
+    Blocks are cut after a newline and a record can't match across a line break (that would need
+    "X\nA" to contain a space), so every line is counted exactly once in constant memory.  Lines
+    are counted too, and any line that isn't one of the 9 types raises ValueError """
+    patterns = [line_type.encode() for line_type in LINE_TYPES]
+    counts = [0] * len(LINE_TYPES)
+    num_lines = 0
+    remainder = b""
+    with open(filename, "rb") as datafile:
+        while True:
+            chunk = datafile.read(CHUNK_SIZE)
+            block = remainder + chunk
+            if chunk:
+                cut = block.rfind(b"\n") + 1
+                block, remainder = block[:cut], block[cut:]
+            elif block:
+                num_lines += 1 # Last line has no newline
+            num_lines += block.count(b"\n")
+            for index, pattern in enumerate(patterns):
+                counts[index] += block.count(pattern)
+            if not chunk:
+                break
+    if sum(counts) != num_lines:
+        raise ValueError(f"Only {sum(counts)} of the {num_lines} lines in {filename} are valid rounds")
+    return counts
+
+def score_strategy_guide(filename: str) -> Tuple[int, int]:
+    """ Score both parts from one histogram, as dot products against the score tables """
+    counts = count_line_types(filename)
+    part1 = sum(count * score for count, score in zip(counts, PART1_SCORES))
+    part2 = sum(count * score for count, score in zip(counts, PART2_SCORES))
+    return part1, part2
+
+if __name__ == "__main__":
+    part1, part2 = score_strategy_guide("Day2Data.txt")
+    print("Part 1:")
+    print(part1)
 
-print("Part 2:")
-total_score = 0
-with open("Day2Data.txt", "r") as datafile:
-    for line in datafile:
-        col1, col2 = line.split()
-        total_score += Round(col1, col2, part2=True).score()
-print(total_score)
\ No newline at end of file
+    print("Part 2:")
+    print(part2)
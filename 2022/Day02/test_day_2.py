@@ -0,0 +1,35 @@
+import pytest
+
+from Day02 import Day2
+from Day02.Day2 import Round, count_line_types, score_strategy_guide
+
+def test_part_1_and_2():
+    print()
+    print("Part 1: What would your total score be if everything goes exactly according to your strategy guide?")
+    print("Part 2: Following the Elf's instructions for the second column, what would your total score be?")
+    part1, part2 = score_strategy_guide("2022/Day02/Day2Data.txt")
+    print(part1, part2)
+    assert part1 == 12156
+    assert part2 == 10835
+
+def test_histogram_matches_rounds(monkeypatch):
+    # Tiny blocks force records to straddle block boundaries
+    monkeypatch.setattr(Day2, "CHUNK_SIZE", 5)
+    part1 = 0
+    part2 = 0
+    with open("2022/Day02/Day2Data.txt", "r") as datafile:
+        for line in datafile:
+            col1, col2 = line.split()
+            part1 += Round(col1, col2).score()
+            part2 += Round(col1, col2, part2=True).score()
+    assert sum(count_line_types("2022/Day02/Day2Data.txt")) == 2500
+    assert score_strategy_guide("2022/Day02/Day2Data.txt") == (part1, part2)
+
+def test_histogram_rejects_bad_lines(tmp_path):
+    datafile = tmp_path / "guide.txt"
+    datafile.write_bytes(b"A X\r\nC Z")
+    assert sum(count_line_types(str(datafile))) == 2
+
+    datafile.write_bytes(b"A X\nD Q\nB  Y\nC Z\n")
+    with pytest.raises(ValueError):
+        count_line_types(str(datafile))
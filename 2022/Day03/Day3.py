@@ -1,26 +1,43 @@
-from typing import Set
+from typing import Iterable, Iterator, Set, Tuple
+from string import ascii_lowercase, ascii_uppercase
 
+# Item priorities, a-z are 1 through 26 and A-Z are 27 through 52.  An item is stored in a mask as
+# bit (priority - 1), so the priority of a single-item mask is just its bit_length()
+ITEMS = ascii_lowercase + ascii_uppercase
+ITEM_BITS = {item: 1 << index for index, item in enumerate(ITEMS)}
 
+def item_mask(items: str) -> int:
+    " Return a 52-bit mask with one bit set per distinct item "
+    mask = 0
+    for item in items:
+        mask |= ITEM_BITS[item]
+    return mask
 
+def mask_items(mask: int) -> Set[str]:
+    items = set()
+    while mask:
+        lowest = mask & -mask
+        items.add(ITEMS[lowest.bit_length() - 1])
+        mask ^= lowest
+    return items
 
 class Rucksack:
     def __init__(self, contents: str):
         self.contents = contents.strip()
-        halfsize = int(len(contents) / 2)
-        self.compartment1 = contents[:halfsize]
-        self.compartment2 = contents[halfsize:]
+        halfsize = len(self.contents) // 2
+        self.compartment1 = self.contents[:halfsize]
+        self.compartment2 = self.contents[halfsize:]
+        self.mask1 = item_mask(self.compartment1)
+        self.mask2 = item_mask(self.compartment2)
+        self.mask = self.mask1 | self.mask2
 
-        print(contents)
-        print(f"{self.compartment1} | {self.compartment2} ----> {self.get_common_items()}")
+    def get_common_mask(self) -> int:
+        " Return a mask of all items present in both compartments. "
+        return self.mask1 & self.mask2
 
     def get_common_items(self) -> Set[str]:
         " Return a Set of all items (letters) present in both compartments. "
-        common_items = set()
-        for item in self.compartment1:
-            if item in self.compartment2:
-                common_items.update(item)
-
-        return common_items
+        return mask_items(self.get_common_mask())
 
 class SafetyGroup:
     def __init__(self, max_size=3):
@@ -40,54 +57,70 @@ class SafetyGroup:
             return True
         return False
 
+    def find_badge_mask(self) -> int:
+        """ Mask of the items carried by every elf in this group """
+        mask = self.elves[0].mask
+        for elf in self.elves[1:]:
+            mask &= elf.mask
+        return mask
+
     def find_badge(self):
         """ Find the common item among all elves in this group """
-        for item in self.elves[0].contents:
-            for elf in self.elves:
-                if item not in elf.contents:
-                    break
-            else:
-                return item
-
-def score_items(items: Set[str]) -> int:
+        badge = self.find_badge_mask()
+        if badge:
+            return ITEMS[badge.bit_length() - 1]
+
+def score_mask(mask: int) -> int:
+    """ Sum of the priorities of every item in the mask """
+    if mask & (mask - 1) == 0:
+        # Zero or one item, which is the common case
+        return mask.bit_length()
     score = 0
-    for item in items:
-        if item.isupper():
-            score += (ord(item) - ord("A") + 27)
-        else:
-            score += (ord(item) - ord("a") + 1)
+    while mask:
+        lowest = mask & -mask
+        score += lowest.bit_length()
+        mask ^= lowest
     return score
 
+def score_items(items: Set[str]) -> int:
+    return score_mask(item_mask(items))
 
 
+def read_rucksacks(lines: Iterable[str]) -> Iterator[Rucksack]:
+    """ Parse each line exactly once, blank lines are skipped """
+    for line in lines:
+        if line.strip():
+            yield Rucksack(line)
 
+def chunk_safety_groups(rucksacks: Iterable[Rucksack], max_size: int=3) -> Iterator[SafetyGroup]:
+    """ Group consecutive rucksacks, a trailing group may be short and has no badge """
+    safety_group = SafetyGroup(max_size)
+    for rucksack in rucksacks:
+        safety_group.add(rucksack)
+        if safety_group.is_full():
+            yield safety_group
+            safety_group = SafetyGroup(max_size)
+    if safety_group.elves:
+        yield safety_group
+
+def score_both_parts(lines: Iterable[str]) -> Tuple[int, int]:
+    """ Single pass over the lines in constant memory, returns (compartment score, badge score) """
+    compartment_score = 0
+    badge_score = 0
+    for safety_group in chunk_safety_groups(read_rucksacks(lines)):
+        for rucksack in safety_group.elves:
+            compartment_score += score_mask(rucksack.get_common_mask())
+        if safety_group.is_full():
+            badge_score += score_mask(safety_group.find_badge_mask())
+    return compartment_score, badge_score
 
-print("Part 1:")
-common_items = set()
-running_score = 0
-with open("Day3Data.txt", "r") as datafile:
-    for line in datafile:
-        rucksack = Rucksack(line)
-        running_score += score_items(rucksack.get_common_items())
-        common_items.update(rucksack.get_common_items())
-print(common_items)
-print(score_items(common_items))
-print(running_score)
 
+if __name__ == "__main__":
+    with open("Day3Data.txt", "r") as datafile:
+        compartment_score, badge_score = score_both_parts(datafile)
 
-print("Part 2:")
-common_items = set()
-running_score = 0
-safety_group = SafetyGroup()
-with open("Day3Data.txt", "r") as datafile:
-    for line in datafile:
-        rucksack = Rucksack(line)
-        safety_group.add(rucksack)
-        if safety_group.is_full():
-            badge = safety_group.find_badge()
-            running_score += score_items(set(badge))
-            safety_group = SafetyGroup()
-            common_items.update(set(badge))
-print(common_items)
-print(score_items(common_items))
-print(running_score)
\ No newline at end of file
+    print("Part 1:")
+    print(compartment_score)
+
+    print("Part 2:")
+    print(badge_score)
@@ -0,0 +1,50 @@
+from Day03.Day3 import Rucksack, SafetyGroup, score_mask, score_items, item_mask, score_both_parts
+
+def test_part_1():
+    print()
+    print("Part 1: What is the sum of the priorities of the item types in both compartments?")
+    running_score = 0
+    with open("2022/Day03/Day3Data.txt", "r") as datafile:
+        for line in datafile:
+            running_score += score_mask(Rucksack(line).get_common_mask())
+
+    print(running_score)
+    assert running_score == 7811
+
+def test_part_2():
+    print()
+    print("Part 2: What is the sum of the priorities of the badge item types of each group?")
+    running_score = 0
+    safety_group = SafetyGroup()
+    with open("2022/Day03/Day3Data.txt", "r") as datafile:
+        for line in datafile:
+            safety_group.add(Rucksack(line))
+            if safety_group.is_full():
+                running_score += score_mask(safety_group.find_badge_mask())
+                safety_group = SafetyGroup()
+
+    print(running_score)
+    assert running_score == 2639
+
+def test_masks():
+    rucksack = Rucksack("vJrwpWtwJgWrhcsFMMfFFhFp\n")
+    assert rucksack.get_common_items() == {"p"}
+    assert score_mask(rucksack.get_common_mask()) == 16
+
+    assert score_items({"a", "Z"}) == 1 + 52
+    assert score_mask(item_mask("aabZ")) == 1 + 2 + 52
+    assert score_mask(0) == 0
+
+    safety_group = SafetyGroup()
+    for contents in ["vJrwpWtwJgWrhcsFMMfFFhFp", "jqHRNqRjqzjGDLGLrsFMfFZSrLrFZsSL", "PmmdzqPrVvPwwTWBwg"]:
+        safety_group.add(Rucksack(contents))
+    assert safety_group.find_badge() == "r"
+
+def test_single_pass():
+    with open("2022/Day03/Day3Data.txt", "r") as datafile:
+        assert score_both_parts(datafile) == (7811, 2639)
+
+    # A short trailing group still counts towards part 1
+    lines = ["vJrwpWtwJgWrhcsFMMfFFhFp\n", "jqHRNqRjqzjGDLGLrsFMfFZSrLrFZsSL\n", "PmmdzqPrVvPwwTWBwg\n",
+             "wMqvLMZHhHMvwLHjbvcjnnSBnvTQFn\n"]
+    assert score_both_parts(lines) == (16 + 38 + 42 + 22, 18)
@@ -1,4 +1,8 @@
-from typing import Tuple
+import re
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
 
 #RangePair = namedtuple('RangePair', ['a', 'b'])
 
@@ -26,23 +30,138 @@ def parse_assignment_pair(line: str) -> Tuple[range, range]:
     range_b = range(int(range_strings[1].split("-")[0]), int(range_strings[1].split("-")[1]))
     return (range_a, range_b)
 
-print("Part 1:")
-redundant_pairs = 0
-with open("Day4Data.txt", "r") as datafile:
-    for line in datafile:
-        range_a, range_b = parse_assignment_pair(line)
-        if is_redundant(range_a, range_b):
-            redundant_pairs += 1
+ASSIGNMENT_DELIMITERS = re.compile(r"[-,\s]+")
+
+def load_assignment_pairs(filename: str) -> np.ndarray:
+    """ Whole file as an (N, 4) array of [a_start, a_stop, b_start, b_stop], stops are inclusive
+    just like the ranges from parse_assignment_pair """
+    with open(filename, "r") as datafile:
+        values = np.fromstring(ASSIGNMENT_DELIMITERS.sub(" ", datafile.read()), dtype=np.int64, sep=" ")
+    return values.reshape(-1, 4)
+
+def count_redundant_and_overlapping(pairs: np.ndarray) -> Tuple[int, int]:
+    """ Vectorized is_redundant and is_overlap over every pair at once """
+    a_start, a_stop, b_start, b_stop = pairs.T
+    redundant = ((a_start <= b_start) & (a_stop >= b_stop)) | ((b_start <= a_start) & (b_stop >= a_stop))
+    overlapping = (a_start <= b_stop) & (b_start <= a_stop)
+    return int(redundant.sum()), int(overlapping.sum())
+
+def read_assignments(filename: str) -> List[range]:
+    """ Every elf's assignment in the file, both halves of each pair flattened into one list """
+    assignments = []
+    with open(filename, "r") as datafile:
+        for line in datafile:
+            if line.strip():
+                assignments.extend(parse_assignment_pair(line))
+    return assignments
+
+def sweep_events(assignments: Iterable[range]) -> List[Tuple[int, int]]:
+    """ Sorted (section, +1/-1) events.  Stops are inclusive, so an assignment leaves the sweep at
+    stop + 1, and at a tie the -1 sorts first, so an assignment ending just before another starts
+    is not counted as overlapping """
+    events = []
+    for assignment in assignments:
+        events.append((assignment.start, 1))
+        events.append((assignment.stop + 1, -1))
+    events.sort()
+    return events
+
+def count_overlapping_assignments(assignments: Iterable[range]) -> int:
+    """ Number of pairs of assignments, anywhere in the file, which share at least one section.
+    Each assignment overlaps everything still active when it starts, O(n log n) for the sort """
+    overlapping = 0
+    active = 0
+    for _, change in sweep_events(assignments):
+        if change > 0:
+            overlapping += active
+        active += change
+    return overlapping
+
+def sections_claimed_by_more_than(assignments: Iterable[range], k: int) -> List[Tuple[int, int]]:
+    """ Maximal (first, last) section spans, inclusive, claimed by more than k elves """
+    spans = []
+    active = 0
+    span_start = None
+    events = sweep_events(assignments)
+    for index, (section, change) in enumerate(events):
+        active += change
+        if index + 1 < len(events) and events[index + 1][0] == section:
+            continue # Apply every event at this section before checking coverage
+        if active > k and span_start is None:
+            span_start = section
+        elif active <= k and span_start is not None:
+            spans.append((span_start, section - 1))
+            span_start = None
+    return spans
+
+class IntervalNode:
+    """ Node of a centered interval tree.  Holds every assignment containing center, sorted both
+    by start and by descending stop so a stabbing query only walks the ones it reports """
+    def __init__(self, center: int, ids: List[int], assignments: List[range]):
+        self.center = center
+        self.by_start = sorted(ids, key=lambda i: assignments[i].start)
+        self.by_stop = sorted(ids, key=lambda i: assignments[i].stop, reverse=True)
+        self.left: Optional[IntervalNode] = None
+        self.right: Optional[IntervalNode] = None
+
+class AssignmentIndex:
+    """ Static interval index over assignments, e.g. from read_assignments where id // 2 is the
+    line and id % 2 the elf.  Stabbing and range queries are O(log n + k) """
+    def __init__(self, assignments: List[range]):
+        self.assignments = assignments
+        self.root = self.build(list(range(len(assignments))))
+        self.ids_by_start = sorted(range(len(assignments)), key=lambda i: assignments[i].start)
+        self.starts = [assignments[i].start for i in self.ids_by_start]
+
+    def build(self, ids: List[int]) -> Optional[IntervalNode]:
+        if not ids:
+            return None
+        endpoints = sorted(e for i in ids for e in (self.assignments[i].start, self.assignments[i].stop))
+        center = endpoints[len(endpoints) // 2]
+        left = [i for i in ids if self.assignments[i].stop < center]
+        right = [i for i in ids if self.assignments[i].start > center]
+        here = [i for i in ids if self.assignments[i].start <= center <= self.assignments[i].stop]
+        node = IntervalNode(center, here, self.assignments)
+        node.left = self.build(left)
+        node.right = self.build(right)
+        return node
+
+    def stab(self, section: int) -> List[int]:
+        """ Ids of every assignment covering section """
+        found = []
+        node = self.root
+        while node:
+            if section < node.center:
+                for i in node.by_start:
+                    if self.assignments[i].start > section:
+                        break
+                    found.append(i)
+                node = node.left
+            elif section > node.center:
+                for i in node.by_stop:
+                    if self.assignments[i].stop < section:
+                        break
+                    found.append(i)
+                node = node.right
+            else:
+                found.extend(node.by_start)
+                break
+        return found
 
-print(f"Redundant pairs: {redundant_pairs}")
+    def overlapping(self, first: int, last: int) -> List[int]:
+        """ Ids of every assignment touching sections first through last, inclusive.  That is
+        everything covering first, plus everything starting inside (first, last] """
+        found = self.stab(first)
+        lo = bisect_right(self.starts, first)
+        hi = bisect_right(self.starts, last)
+        found.extend(self.ids_by_start[lo:hi])
+        return found
 
+if __name__ == "__main__":
+    redundant_pairs, overlapping_pairs = count_redundant_and_overlapping(load_assignment_pairs("Day4Data.txt"))
 
-print("Part 1:")
-overlapping_pairs = 0
-with open("Day4Data.txt", "r") as datafile:
-    for line in datafile:
-        range_a, range_b = parse_assignment_pair(line)
-        if is_overlap(range_a, range_b):
-            overlapping_pairs += 1
+    print("Part 1:")
+    print(f"Redundant pairs: {redundant_pairs}")
 
-print(f"Overlapping pairs: {overlapping_pairs}")
+    print("Part 2:")
+    print(f"Overlapping pairs: {overlapping_pairs}")
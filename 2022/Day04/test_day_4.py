@@ -0,0 +1,61 @@
+from Day04.Day4 import is_redundant, is_overlap, parse_assignment_pair, load_assignment_pairs, count_redundant_and_overlapping, \
+    read_assignments, count_overlapping_assignments, sections_claimed_by_more_than, \
+    AssignmentIndex
+
+def test_part_1_and_2():
+    print()
+    print("Part 1: In how many assignment pairs does one range fully contain the other?")
+    print("Part 2: In how many assignment pairs do the ranges overlap?")
+    pairs = load_assignment_pairs("2022/Day04/Day4Data.txt")
+    redundant_pairs, overlapping_pairs = count_redundant_and_overlapping(pairs)
+    print(redundant_pairs, overlapping_pairs)
+    assert pairs.shape == (1000, 4)
+    assert redundant_pairs == 441
+    assert overlapping_pairs == 861
+
+def test_vectorized_matches_ranges():
+    redundant_pairs = 0
+    overlapping_pairs = 0
+    with open("2022/Day04/Day4Data.txt", "r") as datafile:
+        for line in datafile:
+            range_a, range_b = parse_assignment_pair(line)
+            redundant_pairs += is_redundant(range_a, range_b)
+            overlapping_pairs += is_overlap(range_a, range_b)
+
+    pairs = load_assignment_pairs("2022/Day04/Day4Data.txt")
+    assert count_redundant_and_overlapping(pairs) == (redundant_pairs, overlapping_pairs)
+
+def test_sweep_line():
+    assignments = read_assignments("2022/Day04/Day4Data.txt")[:300]
+    overlapping = 0
+    for i, a in enumerate(assignments):
+        for b in assignments[i + 1:]:
+            overlapping += is_overlap(a, b)
+    assert count_overlapping_assignments(assignments) == overlapping
+
+    claims = [0] * 100
+    for assignment in assignments:
+        for section in range(assignment.start, assignment.stop + 1):
+            claims[section] += 1
+    for k in [0, 10, 50]:
+        crowded = set()
+        for first, last in sections_claimed_by_more_than(assignments, k):
+            crowded.update(range(first, last + 1))
+        assert crowded == {section for section, count in enumerate(claims) if count > k}
+
+    assert sections_claimed_by_more_than([range(1, 3), range(3, 5), range(6, 6)], 1) == [(3, 3)]
+    assert sections_claimed_by_more_than([range(1, 3), range(4, 5)], 0) == [(1, 5)]
+    assert count_overlapping_assignments([range(1, 3), range(3, 5), range(6, 6)]) == 1
+
+def test_interval_index():
+    assignments = read_assignments("2022/Day04/Day4Data.txt")
+    index = AssignmentIndex(assignments)
+    for section in range(0, 101):
+        expected = [i for i, a in enumerate(assignments) if a.start <= section <= a.stop]
+        assert sorted(index.stab(section)) == expected
+
+    for first, last in [(0, 0), (5, 5), (10, 20), (33, 34), (90, 120)]:
+        expected = [i for i, a in enumerate(assignments) if is_overlap(a, range(first, last))]
+        assert sorted(index.overlapping(first, last)) == expected
+
+    assert AssignmentIndex([]).stab(3) == []
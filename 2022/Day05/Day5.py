@@ -1,11 +1,24 @@
-from collections import deque 
+import re
+from array import array
+from typing import Iterable, List, Tuple
 
 
 
+MOVE = re.compile(r"move (\d+) from (\d+) to (\d+)")
+
+def compile_moves(lines: Iterable[str]) -> array:
+    """ Flat array of (count, origin, target) triples, origin and target are 0-indexed """
+    moves = array("q")
+    for line in lines:
+        match = MOVE.search(line)
+        if match:
+            moves.extend((int(match[1]), int(match[2]) - 1, int(match[3]) - 1))
+    return moves
+
 class Stack:
-    """ 0-index is top of stack, n-index is bottom """
+    """ 0-index is bottom of stack, n-index is top once the map has been read """
     def __init__(self):
-        self.contents = deque()
+        self.contents = []
 
     def build(self, item: str):
         self.contents.append(item)
@@ -26,13 +39,158 @@ class Stack:
         return self.contents[item]
 
     def push(self, item: str):
-        self.contents.appendleft(item)
+        self.contents.insert(0, item)
+
+    def lift(self, count: int, reverse: bool=False) -> list:
+        """ Remove the top count crates in one slice, reversed if they come off one at a time """
+        if count <= 0:
+            return []
+        if reverse:
+            crates = self.contents[:-count - 1:-1]
+        else:
+            crates = self.contents[-count:]
+        del self.contents[-count:]
+        return crates
+
+    def lower(self, crates: list):
+        self.contents.extend(crates)
+
+class Segment:
+    """ A run of crates[start:stop] shared with other segments, read top-down when reversed """
+    def __init__(self, crates: list, start: int, stop: int, reversed: bool=False):
+        self.crates = crates
+        self.start = start
+        self.stop = stop
+        self.reversed = reversed
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, index: int):
+        """ index 0 is the bottom crate of this segment """
+        if self.reversed:
+            return self.crates[self.stop - 1 - index]
+        return self.crates[self.start + index]
+
+    def flipped(self) -> "Segment":
+        return Segment(self.crates, self.start, self.stop, not self.reversed)
+
+    def split(self, count: int) -> Tuple["Segment", "Segment"]:
+        """ (bottom, top) where bottom holds the lowest count crates """
+        if self.reversed:
+            return (Segment(self.crates, self.stop - count, self.stop, True),
+                    Segment(self.crates, self.start, self.stop - count, True))
+        return (Segment(self.crates, self.start, self.start + count),
+                Segment(self.crates, self.start + count, self.stop))
+
+    def materialize(self) -> list:
+        crates = self.crates[self.start:self.stop]
+        if self.reversed:
+            crates.reverse()
+        return crates
+
+class SegmentStack:
+    """ Piece-table Stack, bottom to top is a list of Segments over shared crate lists.  Moves relink
+    segments in O(number of segments) without copying crates, and once a stack is fragmented into
+    more than max_segments pieces it is compacted back into one list """
+    def __init__(self, max_segments: int=64):
+        self.segments: List[Segment] = []
+        self.length = 0
+        self.max_segments = max_segments
+
+    @classmethod
+    def from_crates(cls, crates: list, max_segments: int=64) -> "SegmentStack":
+        stack = cls(max_segments)
+        stack.lower([Segment(crates, 0, len(crates))])
+        return stack
+
+    def build(self, item: str):
+        self.drop(item)
+
+    def top(self):
+        return self.segments[-1][len(self.segments[-1]) - 1]
+
+    def pop(self):
+        return self.lift(1)[0][0]
+
+    def drop(self, item: str):
+        self.lower([Segment([item], 0, 1)])
+
+    def push(self, item: str):
+        self.segments.insert(0, Segment([item], 0, 1))
+        self.length += 1
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, item):
+        if item < 0:
+            item += self.length
+        if not 0 <= item < self.length:
+            raise IndexError("SegmentStack index out of range")
+        for segment in self.segments:
+            if item < len(segment):
+                return segment[item]
+            item -= len(segment)
+
+    def lift(self, count: int, reverse: bool=False) -> List[Segment]:
+        """ Unlink the top count crates as segments, bottom to top.  Coming off one at a time
+        reverses the run, which is just the segments in the other order and each one flipped """
+        count = min(count, self.length)
+        self.length -= count
+        taken = []
+        while count > 0:
+            segment = self.segments.pop()
+            if len(segment) > count:
+                segment, top = segment.split(len(segment) - count)
+                self.segments.append(segment)
+                segment = top
+            taken.append(segment)
+            count -= len(segment)
+        if reverse:
+            return [segment.flipped() for segment in taken]
+        taken.reverse()
+        return taken
+
+    def lower(self, segments: List[Segment]):
+        for segment in segments:
+            if len(segment):
+                self.segments.append(segment)
+                self.length += len(segment)
+        if len(self.segments) > self.max_segments:
+            self.compact()
+
+    def compact(self):
+        crates = []
+        for segment in self.segments:
+            crates.extend(segment.materialize())
+        self.segments = [Segment(crates, 0, len(crates))] if crates else []
+
+    @property
+    def contents(self) -> list:
+        """ Bottom to top, materialized for compatibility with Stack """
+        crates = []
+        for segment in self.segments:
+            crates.extend(segment.materialize())
+        return crates
 
 class Pile:
     def __init__(self):
         self.map_complete = False
         self.stacks = []
 
+    def copy(self, segmented: bool=False) -> "Pile":
+        """ Independent copy, optionally backed by SegmentStacks for enormous moves """
+        pile = Pile()
+        pile.map_complete = self.map_complete
+        for stack in self.stacks:
+            if segmented:
+                pile.stacks.append(SegmentStack.from_crates(list(stack.contents)))
+            else:
+                pile.stacks.append(Stack())
+                pile.stacks[-1].contents = list(stack.contents)
+        return pile
+
     def render(self):
         max_len = 0
         for stack in self.stacks:
@@ -77,59 +235,88 @@ class Pile:
                 self.stacks[stack].build((line[1]))
             line = line[4:]
 
+    def move_crates(self, count: int, origin: int, target: int, multiple: bool=False):
+        """ CrateMover 9000 moves crates one at a time, which is the same as a reversed slice.
+        The 9001 moves them all at once.  Either way a move onto the same stack changes nothing """
+        if origin == target:
+            return
+        self.stacks[target].lower(self.stacks[origin].lift(count, reverse=not multiple))
+
+    def execute_moves(self, moves: array, multiple: bool=False):
+        for index in range(0, len(moves), 3):
+            self.move_crates(moves[index], moves[index + 1], moves[index + 2], multiple)
+
     def execute_move(self, move :str):
         """ Crates are moved one at a time! """
         """move 3 from 1 to 3"""
-        move = move.strip().split()
-        num_to_move = int(move[1])
-        origin_stack = int(move[3]) - 1 # 1 -> 0 Indexed
-        target_stack = int(move[5]) - 1 # 1 -> 0 Indexed
-        while num_to_move > 0:
-            crate = self.stacks[origin_stack].pop()
-            self.stacks[target_stack].drop(crate)
-            num_to_move -= 1
+        self.execute_moves(compile_moves([move]))
 
     def execute_move_multiple(self, move :str):
         """ Crates are moved all at once! """
         """move 3 from 1 to 3"""
-        move = move.strip().split()
-        num_to_move = int(move[1])
-        origin_stack = int(move[3]) - 1 # 1 -> 0 Indexed
-        target_stack = int(move[5]) - 1 # 1 -> 0 Indexed
-        crane = deque()
-        for _ in range(num_to_move):
-            crane.append(self.stacks[origin_stack].pop())
+        self.execute_moves(compile_moves([move]), multiple=True)
 
-        for _ in range(num_to_move):
-            self.stacks[target_stack].drop(crane.pop())
+def load_puzzle(filename: str) -> Tuple[Pile, array]:
+    """ Read the starting map and compile the move list, each only once """
+    pile = Pile()
+    with open(filename, "r") as datafile:
+        for line in datafile:
+            pile.read_map_line(line)
+            if pile.map_complete:
+                break
+        moves = compile_moves(datafile)
+    return pile, moves
 
+def get_tops(pile: Pile) -> str:
+    return "".join(stack.top() for stack in pile.stacks if len(stack))
 
+def trace_tops(pile: Pile, moves: array, multiple: bool=False) -> str:
+    """ Final top crates without running the moves.  Each final top is tracked as (stack, depth
+    below the top) and the moves are undone in reverse, so only the starting pile is ever read.
+    O(moves x stacks) no matter how many crates are moved """
+    heights = [len(stack) for stack in pile.stacks]
+    counts = array("q") # Moves asking for more crates than a stack holds only move what is there
+    for index in range(0, len(moves), 3):
+        count, origin, target = moves[index:index + 3]
+        if origin == target:
+            count = 0 # Moving onto the same stack changes nothing, as in Pile.move_crates
+        counts.append(min(count, heights[origin]))
+        heights[origin] -= counts[-1]
+        heights[target] += counts[-1]
 
+    positions = [[stack, 0] for stack, height in enumerate(heights) if height]
+    for index in range(len(moves) - 3, -1, -3):
+        _, origin, target = moves[index:index + 3]
+        count = counts[index // 3]
+        if count == 0:
+            continue
+        for position in positions:
+            stack, depth = position
+            if stack == target and depth < count:
+                # This crate arrived with the move, find where it sat in the origin stack
+                position[0] = origin
+                position[1] = depth if multiple else count - 1 - depth
+            elif stack == target:
+                position[1] = depth - count
+            elif stack == origin:
+                position[1] = depth + count
 
-print("Part 1:")
-pile = Pile()
-with open("Day5Data.txt", "r") as datafile:
-    for line in datafile:
-        if not pile.map_complete:
-            pile.read_map_line(line)
-        else:
-            pile.execute_move(line)
-
-for stack in pile.stacks:
-    print(stack.top(), end="")
-print()
-pile.render()
-
-print("Part 2:")
-pile = Pile()
-with open("Day5Data.txt", "r") as datafile:
-    for line in datafile:
-        if not pile.map_complete:
-            pile.read_map_line(line)
-        else:
-            pile.execute_move_multiple(line)
+    return "".join(pile.stacks[stack][-1 - depth] for stack, depth in positions)
+
+
+if __name__ == "__main__":
+    starting_pile, moves = load_puzzle("Day5Data.txt")
+
+    print("Part 1:")
+    print(trace_tops(starting_pile, moves))
+    pile = starting_pile.copy()
+    pile.execute_moves(moves)
+    print(get_tops(pile))
+    pile.render()
 
-for stack in pile.stacks:
-    print(stack.top(), end="")
-print()
-pile.render()
\ No newline at end of file
+    print("Part 2:")
+    print(trace_tops(starting_pile, moves, multiple=True))
+    pile = starting_pile.copy()
+    pile.execute_moves(moves, multiple=True)
+    print(get_tops(pile))
+    pile.render()
@@ -0,0 +1,98 @@
+from Day05.Day5 import Pile, SegmentStack, load_puzzle, trace_tops, compile_moves, get_tops
+
+def test_part_1():
+    print()
+    print("Part 1: After the rearrangement procedure completes, what crate ends up on top of each stack?")
+    pile, moves = load_puzzle("2022/Day05/Day5Data.txt")
+    pile.execute_moves(moves)
+    print(get_tops(pile))
+    assert get_tops(pile) == "DHBJQJCCW"
+
+def test_part_2():
+    print()
+    print("Part 2: With the CrateMover 9001, what crate ends up on top of each stack?")
+    pile, moves = load_puzzle("2022/Day05/Day5Data.txt")
+    pile.execute_moves(moves, multiple=True)
+    print(get_tops(pile))
+    assert get_tops(pile) == "WJVRLSJJT"
+
+def test_compiled_moves_match_strings():
+    starting_pile, moves = load_puzzle("2022/Day05/Day5Data.txt")
+    assert len(moves) == 3 * 502
+    assert moves[:6].tolist() == [2, 1, 7, 2, 0, 5]
+    assert len(compile_moves(["", "move 0 from 1 to 2\n"])) == 3
+
+    pile_9000 = starting_pile.copy()
+    pile_9001 = starting_pile.copy()
+    with open("2022/Day05/Day5Data.txt", "r") as datafile:
+        for line in datafile:
+            if line.startswith("move"):
+                pile_9000.execute_move(line)
+                pile_9001.execute_move_multiple(line)
+    assert get_tops(pile_9000) == "DHBJQJCCW"
+    assert get_tops(pile_9001) == "WJVRLSJJT"
+    # Copies never share crates with the starting pile
+    assert get_tops(starting_pile) == "RPCRNJRJW"
+
+def test_segment_stacks():
+    starting_pile, moves = load_puzzle("2022/Day05/Day5Data.txt")
+    for multiple, tops in [(False, "DHBJQJCCW"), (True, "WJVRLSJJT")]:
+        pile = starting_pile.copy()
+        segmented_pile = starting_pile.copy(segmented=True)
+        pile.execute_moves(moves, multiple)
+        segmented_pile.execute_moves(moves, multiple)
+        assert get_tops(segmented_pile) == tops
+        for stack, segmented_stack in zip(pile.stacks, segmented_pile.stacks):
+            assert segmented_stack.contents == stack.contents
+            assert len(segmented_stack.segments) <= segmented_stack.max_segments
+
+def test_move_onto_same_stack():
+    starting_pile, _ = load_puzzle("2022/Day05/Day5Data.txt")
+    for segmented in [False, True]:
+        pile = starting_pile.copy(segmented=segmented)
+        before = [stack.contents for stack in pile.stacks]
+        pile.execute_move("move 2 from 1 to 1")
+        pile.execute_move_multiple("move 3 from 2 to 2")
+        assert [stack.contents for stack in pile.stacks] == before
+
+def test_segment_stack_huge_moves():
+    crates = list(range(1_000_000))
+    origin = SegmentStack.from_crates(crates)
+    target = SegmentStack()
+    for _ in range(1000):
+        target.lower(origin.lift(999_999, reverse=True))
+        origin.lower(target.lift(999_999, reverse=True))
+    # Crates were never copied, only relinked
+    assert all(segment.crates is crates for segment in origin.segments)
+    assert origin.contents == crates
+    assert len(target) == 0
+
+    origin.drop("x")
+    origin.push("y")
+    assert origin.pop() == "x"
+    assert origin[0] == "y"
+    assert origin[-1] == 999_999
+
+def test_trace_tops():
+    pile, moves = load_puzzle("2022/Day05/Day5Data.txt")
+    assert trace_tops(pile, moves) == "DHBJQJCCW"
+    assert trace_tops(pile, moves, multiple=True) == "WJVRLSJJT"
+
+    # An emptied stack has no top, just like get_tops
+    moves = compile_moves(["move 8 from 1 to 2", "move 1 from 2 to 3"])
+    for multiple in [False, True]:
+        moved_pile = pile.copy()
+        moved_pile.execute_moves(moves, multiple)
+        assert trace_tops(pile, moves, multiple) == get_tops(moved_pile)
+
+    # A move onto the same stack leaves the crates below it where they were
+    pile = Pile()
+    for line in ["[A] [F]\n", "[B] [D]\n", "[C] [E]\n", " 1   2 \n", "\n"]:
+        pile.read_map_line(line)
+    moves = compile_moves(["move 1 from 1 to 1", "move 2 from 1 to 2"])
+    for multiple, tops in [(False, "CB"), (True, "CA")]:
+        moved_pile = pile.copy()
+        moved_pile.execute_moves(moves, multiple)
+        assert get_tops(moved_pile) == tops
+        assert trace_tops(pile, moves, multiple) == tops
+
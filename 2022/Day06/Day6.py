@@ -1,54 +1,98 @@
-from collections import deque 
+import mmap
+import os
+from collections import Counter, deque 
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Optional
 
 
 
 class Window:
+    """ Sliding window which keeps a count of each character and of how many repeats are inside
+    it, so feeding a character and checking for a marker are both O(1) """
     def __init__(self, length: int=4):
         self.contents = deque()
         self.length = length
         self.index = 0
+        self.counts = Counter()
+        self.duplicates = 0
 
     def feed(self, character: str):
         if len(self.contents) == self.length:
-            self.contents.popleft()
+            oldest = self.contents.popleft()
+            self.counts[oldest] -= 1
+            if self.counts[oldest]:
+                self.duplicates -= 1
         elif len(self.contents) > self.length:
             print("TODO this shouldn't happen, handle this error case")
 
+        if self.counts[character]:
+            self.duplicates += 1
+        self.counts[character] += 1
         self.contents.append(character)
         self.index += 1
 
     def is_start_marker(self):
-        if len(self.contents) != self.length:
-            return False
-        unique_chars = set()
-        for c in range(self.length):
-            if self.contents[c] in unique_chars:
-                return False
-            else:
-                unique_chars.add(self.contents[c])
-        return True
-
-
-
-print("Part 1:")
-window = Window()
-with open("Day6Data.txt", "r") as datafile:
-    for line in datafile:
-        for character in line:
-            window.feed(character)
-            if window.is_start_marker():
-                print(window.index)
-                print(window.contents)
-                break
-
-print("Part 2:")
-window = Window(length=14)
-with open("Day6Data.txt", "r") as datafile:
-    for line in datafile:
-        for character in line:
-            window.feed(character)
-            if window.is_start_marker():
-                print(window.index)
-                print(window.contents)
-                break
+        return len(self.contents) == self.length and self.duplicates == 0
 
+def find_markers(stream: bytes, lengths: Iterable[int]=(4, 14)) -> Dict[int, int]:
+    """ One pass over the stream for every window length.  Tracks the last index each byte was
+    seen, which gives the longest run of distinct bytes ending here; a marker of length L ends at
+    the first index where that run reaches L.  Returns {length: characters processed} """
+    pending = sorted(set(lengths))
+    markers = {}
+    last_seen = [-1] * 256
+    run_start = 0
+    for index, code in enumerate(stream):
+        if last_seen[code] >= run_start:
+            run_start = last_seen[code] + 1
+        last_seen[code] = index
+        while pending and index - run_start + 1 >= pending[0]:
+            markers[pending.pop(0)] = index + 1
+        if not pending:
+            break
+    return markers
+
+
+def find_marker_in_range(filename: str, start: int, stop: int, length: int) -> Optional[int]:
+    """ Process pool worker, scan one byte range of the mmapped stream """
+    with open(filename, "rb") as datafile:
+        with mmap.mmap(datafile.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            markers = find_markers(buf[start:stop], (length,))
+    if length in markers:
+        return start + markers[length]
+    return None
+
+def parallel_find_marker(filename: str, length: int, workers: Optional[int]=None,
+                         chunk_size: int=1 << 26) -> Optional[int]:
+    """ Earliest marker in a large capture.  Chunks overlap by length - 1 bytes so no window is
+    missed, and only a few more chunks than workers are queued at once.  Chunks are checked in
+    order, and once one finds a marker the pool is shut down without waiting for the rest """
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(filename)
+    ranges = ((start, min(start + chunk_size + length - 1, size)) for start in range(0, size, chunk_size))
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        for start, stop in ranges:
+            pending.append(pool.submit(find_marker_in_range, filename, start, stop, length))
+            if len(pending) > workers:
+                marker = pending.popleft().result()
+                if marker is not None:
+                    return marker
+        while pending:
+            marker = pending.popleft().result()
+            if marker is not None:
+                return marker
+        return None
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+if __name__ == "__main__":
+    with open("Day6Data.txt", "rb") as datafile:
+        markers = find_markers(datafile.read(), (4, 14))
+
+    print("Part 1:")
+    print(markers[4])
+
+    print("Part 2:")
+    print(markers[14])
@@ -0,0 +1,46 @@
+from Day06.Day6 import Window, find_markers, parallel_find_marker
+
+def test_part_1_and_2():
+    print()
+    print("Part 1: How many characters need to be processed before the first start-of-packet marker is detected?")
+    print("Part 2: How many characters need to be processed before the first start-of-message marker is detected?")
+    with open("2022/Day06/Day6Data.txt", "rb") as datafile:
+        markers = find_markers(datafile.read(), (4, 14))
+    print(markers)
+    assert markers == {4: 1702, 14: 3559}
+
+def test_window():
+    with open("2022/Day06/Day6Data.txt", "r") as datafile:
+        stream = datafile.read()
+    for length, expected in [(4, 1702), (14, 3559)]:
+        window = Window(length)
+        for character in stream:
+            window.feed(character)
+            if window.is_start_marker():
+                break
+        assert window.index == expected
+
+def test_window_any_character():
+    window = Window(4)
+    for character in "abcé€":
+        window.feed(character)
+    assert window.is_start_marker()
+    window.feed("é")
+    assert not window.is_start_marker()
+
+def test_examples():
+    assert find_markers(b"mjqjpqmgbljsphdztnvjfqwrcgsmlb") == {4: 7, 14: 19}
+    assert find_markers(b"nznrnfrfntjfmvfwmzdfjlvtqnbhcprsg", (14, 4, 4)) == {4: 10, 14: 29}
+    assert find_markers(b"aaaa", (4,)) == {}
+
+def test_parallel_chunks(tmp_path):
+    for chunk_size in [7, 100, 1702, 4096]:
+        assert parallel_find_marker("2022/Day06/Day6Data.txt", 4, workers=2, chunk_size=chunk_size) == 1702
+        assert parallel_find_marker("2022/Day06/Day6Data.txt", 14, workers=2, chunk_size=chunk_size) == 3559
+
+    no_marker = tmp_path / "no_marker.txt"
+    no_marker.write_bytes(b"abcabcabc")
+    assert parallel_find_marker(str(no_marker), 4, workers=2, chunk_size=4) is None
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    assert parallel_find_marker(str(empty), 4) is None
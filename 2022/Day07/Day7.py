@@ -1,5 +1,9 @@
-
 """ FTree should implement a file tree in which a particular node records the space of all files at this level and all it's children """
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
 
 class FTreeNode:
     def __init__(self, name: str, parent=None):
@@ -11,6 +15,28 @@ class FTreeNode:
 
 
 
+class SizeIndex:
+    """ Directory sizes sorted once, with prefix sums, so each threshold query is one bisect """
+    def __init__(self, sizes: Iterable[int]):
+        self.sizes = array("q", sorted(sizes))
+        self.prefix_sums = array("q", accumulate(self.sizes, initial=0))
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def sum_under(self, threshold: int=100_000) -> int:
+        """ Total of every directory smaller than threshold, as get_cumulative_usage_under """
+        return self.prefix_sums[bisect_left(self.sizes, threshold)]
+
+    def smallest_at_least(self, threshold: int) -> Optional[int]:
+        """ Smallest directory of at least threshold, as get_smallest_dir_more_than """
+        index = bisect_left(self.sizes, threshold)
+        if index == len(self.sizes):
+            return None
+        return self.sizes[index]
+
+
+
 class FTree:
     def __init__(self):
         self.root = FTreeNode("/")
@@ -30,12 +56,42 @@ class FTree:
         """ Create node at dest and make current node it's parent """
         if dest not in self.current_node.children:
             self.current_node.children[dest] = FTreeNode(dest, self.current_node)
-    
+
+    def ls(self):
+        pass
+
+    def add_file(self, filename: str, size: int):
+        """ Add or resize a file in the current directory, keeping every ancestor's usage current """
+        node = self.current_node
+        delta = size - node.files.get(filename, 0)
+        node.files[filename] = size
+        self.propagate(node, delta)
+
+    def remove_file(self, filename: str):
+        node = self.current_node
+        self.propagate(node, -node.files.pop(filename))
+
+    def remove_dir(self, dest: str):
+        """ Delete a child of the current directory along with everything under it """
+        child = self.current_node.children.pop(dest)
+        self.propagate(self.current_node, -child.usage)
+
+    def propagate(self, node: FTreeNode, delta: int):
+        """ Apply a change in size to node and all of its ancestors, O(depth) """
+        if delta == 0:
+            return
+        while node:
+            node.usage += delta
+            node = node.parent
+
     def get_usage(self):
-        return self.depth_first_sum(self.root)
+        """ Usage is maintained as files come and go, so this is just a read """
+        return self.root.usage
 
     def depth_first_sum(self, node: FTreeNode):
+        """ Recompute usage from scratch, only needed if files were edited behind add_file's back """
         # 1. Get usage of all children
+        node.usage = 0
         for child in node.children:
             node.usage += self.depth_first_sum(node.children[child])
 
@@ -45,6 +101,17 @@ class FTree:
         # 3. Return node.usage
         return node.usage
 
+    def walk(self) -> Iterator[FTreeNode]:
+        """ Every node, iteratively so deep trees don't hit the recursion limit """
+        nodes = [self.root]
+        while nodes:
+            node = nodes.pop()
+            yield node
+            nodes.extend(node.children.values())
+
+    def get_size_index(self) -> SizeIndex:
+        return SizeIndex(node.usage for node in self.walk())
+
     def get_cumulative_usage_under(self, node: FTreeNode, threshold: int=100_000):
         # 1. Check all children first
         # 2. If this node's sum matches, accumulate it
@@ -77,37 +144,140 @@ class FTree:
             self.render(node.children[child], level + 1)
 
 
+class ArrayTree:
+    """ Compact FTree for transcripts with millions of directories.  Directories are ids into
+    parallel arrays (parent, own file bytes, aggregate bytes) with interned names, and the only
+    per-directory object is the one (parent, name) -> id entry used to cd into children """
+    def __init__(self):
+        self.parent = array("q", [-1])
+        self.own_bytes = array("q", [0])
+        self.total_bytes = array("q")
+        self.names = [sys.intern("/")]
+        self.children: Dict[Tuple[int, str], int] = {}
+        self.listed = bytearray(1) # Files are only counted the first time a directory is listed
+        self.current = 0
+        self.counting = False
 
+    def __len__(self):
+        return len(self.parent)
 
-print("Part 1:")
-tree = FTree()
-with open("Day7Data.txt", "r") as datafile:
-    for line in datafile:
+    def cd(self, dest: str):
+        self.counting = False
+        if dest == "/":
+            self.current = 0
+        elif dest == "..":
+            self.current = self.parent[self.current]
+        else:
+            self.current = self.children[(self.current, dest)]
+
+    def dir(self, dest: str):
+        key = (self.current, sys.intern(dest))
+        if key not in self.children:
+            self.children[key] = len(self.parent)
+            self.parent.append(self.current)
+            self.own_bytes.append(0)
+            self.names.append(key[1])
+            self.listed.append(0)
+
+    def ls(self):
+        self.counting = not self.listed[self.current]
+        self.listed[self.current] = 1
+
+    def add_file(self, filename: str, size: int):
+        if self.counting:
+            self.own_bytes[self.current] += size
+
+    def aggregate(self) -> array:
+        """ Iterative post-order sum.  A child's id is always greater than its parent's, so walking
+        ids backwards finishes every child before its parent """
+        self.total_bytes = array("q", self.own_bytes)
+        for node in range(len(self.parent) - 1, 0, -1):
+            self.total_bytes[self.parent[node]] += self.total_bytes[node]
+        return self.total_bytes
+
+    def get_usage(self) -> int:
+        return self.aggregate()[0]
+
+    def get_size_index(self) -> SizeIndex:
+        return SizeIndex(self.aggregate())
+
+def read_transcript(tree, lines: Iterable[str]):
+    """ Replay a $ cd / $ ls transcript into an FTree or ArrayTree """
+    for line in lines:
         match (line.strip().split()):
             case ["$", "cd", path]:
                 tree.cd(path)
             case ["$", "ls"]:
-                pass
+                tree.ls()
             case ["dir", path]:
                 tree.dir(path)
             case [size, filename]:
-                tree.current_node.files[filename] = int(size)
+                tree.add_file(filename, int(size))
+
+class ThresholdSink:
+    """ Size sink answering both SizeIndex queries for one threshold pair in O(1) memory """
+    def __init__(self, under: int=100_000, at_least: int=0):
+        self.under = under
+        self.at_least = at_least
+        self.sum_under = 0
+        self.smallest_at_least: Optional[int] = None
+
+    def __call__(self, size: int):
+        if size < self.under:
+            self.sum_under += size
+        if size >= self.at_least and (self.smallest_at_least is None or size < self.smallest_at_least):
+            self.smallest_at_least = size
+
+def stream_directory_sizes(lines: Iterable[str], sink: Callable[[int], None]) -> int:
+    """ Directory sizes without building a tree.  Only the totals of the directories on the
+    current path are kept, and a directory's total goes to sink when cd pops it, so memory is
+    O(depth).  Like a real walk, every directory must be entered at most once.  Returns the root
+    total, which is the last size sent to sink """
+    path = [0]
+    for line in lines:
+        match (line.strip().split()):
+            case ["$", "cd", "/"]:
+                while len(path) > 1:
+                    size = path.pop()
+                    path[-1] += size
+                    sink(size)
+            case ["$", "cd", ".."]:
+                size = path.pop()
+                path[-1] += size
+                sink(size)
+            case ["$", "cd", _]:
+                path.append(0)
+            case ["$", "ls"] | ["dir", _]:
+                pass
+            case [size, _]:
+                path[-1] += int(size)
+    while len(path) > 1:
+        size = path.pop()
+        path[-1] += size
+        sink(size)
+    sink(path[0])
+    return path[0]
+
+
+if __name__ == "__main__":
+    print("Part 1:")
+    tree = FTree()
+    with open("Day7Data.txt", "r") as datafile:
+        read_transcript(tree, datafile)
+
+    full_usage = tree.get_usage()
+    print(full_usage)
 
-full_usage = tree.get_usage()
-print(full_usage)
+    size_index = tree.get_size_index()
+    print(size_index.sum_under(100_000))
 
-tree.get_cumulative_usage_under(tree.root)
-print(tree.accumulator)
-           
 
-print("Part 2: Find the smallest directory to delete such that unused space is at least 30_000_000, Total disk size is 70_000_000")
-needed_space = 30_000_000
-total_size = 70_000_000
-total_usage = tree.root.usage
-smallest_deletion = total_usage - (total_size - needed_space)
-print(f"Smallest allowable deletion is: {smallest_deletion}")
-tree.get_smallest_dir_more_than(tree.root, smallest_deletion)
-print(tree.smallest_node.usage)
+    print("Part 2: Find the smallest directory to delete such that unused space is at least 30_000_000, Total disk size is 70_000_000")
+    needed_space = 30_000_000
+    total_size = 70_000_000
+    smallest_deletion = full_usage - (total_size - needed_space)
+    print(f"Smallest allowable deletion is: {smallest_deletion}")
+    print(size_index.smallest_at_least(smallest_deletion))
 
 
-#tree.render(tree.root)
\ No newline at end of file
+    #tree.render(tree.root)
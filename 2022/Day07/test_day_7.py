@@ -0,0 +1,112 @@
+from Day07.Day7 import FTree, ArrayTree, SizeIndex, ThresholdSink, read_transcript, stream_directory_sizes
+
+def test_part_1():
+    print()
+    print("Part 1: What is the sum of the total sizes of directories with a total size of at most 100000?")
+    tree = FTree()
+    with open("2022/Day07/Day7Data.txt", "r") as datafile:
+        read_transcript(tree, datafile)
+
+    assert tree.get_usage() == 43313415
+    tree.get_cumulative_usage_under(tree.root)
+    print(tree.accumulator)
+    assert tree.accumulator == 1477771
+
+def test_part_2():
+    print()
+    print("Part 2: What is the total size of the smallest directory that would free up enough space?")
+    tree = FTree()
+    with open("2022/Day07/Day7Data.txt", "r") as datafile:
+        read_transcript(tree, datafile)
+
+    smallest_deletion = tree.get_usage() - (70_000_000 - 30_000_000)
+    tree.get_smallest_dir_more_than(tree.root, smallest_deletion)
+    print(tree.smallest_node.usage)
+    assert tree.smallest_node.usage == 3579501
+
+def test_array_tree():
+    tree = ArrayTree()
+    with open("2022/Day07/Day7Data.txt", "r") as datafile:
+        read_transcript(tree, datafile)
+
+    totals = tree.aggregate()
+    assert len(tree) == 185
+    assert tree.get_usage() == 43313415
+    assert sum(total for total in totals if total < 100_000) == 1477771
+    assert min(total for total in totals if total >= 3313415) == 3579501
+
+def test_array_tree_deep():
+    # Far deeper than the recursion limit, and listing a directory twice doesn't double count
+    depth = 50_000
+    lines = ["$ cd /"]
+    for _ in range(depth):
+        lines += ["$ ls", "1 a.txt", "dir d", "$ cd d"]
+    lines += ["$ cd ..", "$ ls", "1 a.txt", "dir d"]
+    tree = ArrayTree()
+    read_transcript(tree, lines)
+    assert tree.get_usage() == depth
+    assert tree.total_bytes[-1] == 0
+    assert tree.total_bytes[-2] == 1
+
+def test_incremental_usage():
+    tree = FTree()
+    with open("2022/Day07/Day7Data.txt", "r") as datafile:
+        read_transcript(tree, datafile)
+    assert tree.get_usage() == 43313415
+    assert tree.depth_first_sum(tree.root) == 43313415
+    assert tree.depth_first_sum(tree.root) == 43313415
+
+    tree.cd("/")
+    tree.cd("bhtvbj")
+    bhtvbj_usage = tree.current_node.usage
+    tree.add_file("new.txt", 100)
+    assert tree.current_node.usage == bhtvbj_usage + 100
+    assert tree.get_usage() == 43313415 + 100
+    tree.add_file("new.txt", 40)
+    assert tree.get_usage() == 43313415 + 40
+    tree.remove_file("new.txt")
+    assert tree.get_usage() == 43313415
+
+    dmd_usage = tree.current_node.children["dmd"].usage
+    tree.remove_dir("dmd")
+    assert tree.current_node.usage == bhtvbj_usage - dmd_usage
+    assert tree.get_usage() == 43313415 - dmd_usage
+    assert tree.depth_first_sum(tree.root) == 43313415 - dmd_usage
+
+def test_size_index():
+    for tree in [FTree(), ArrayTree()]:
+        with open("2022/Day07/Day7Data.txt", "r") as datafile:
+            read_transcript(tree, datafile)
+        size_index = tree.get_size_index()
+        assert len(size_index) == 185
+        assert size_index.sum_under(100_000) == 1477771
+        assert size_index.smallest_at_least(3313415) == 3579501
+
+    size_index = SizeIndex([5, 1, 3, 3])
+    assert size_index.sum_under(3) == 1
+    assert size_index.sum_under(4) == 7
+    assert size_index.sum_under(100) == 12
+    assert size_index.smallest_at_least(2) == 3
+    assert size_index.smallest_at_least(6) is None
+
+def test_streaming_sizes():
+    sizes = []
+    with open("2022/Day07/Day7Data.txt", "r") as datafile:
+        assert stream_directory_sizes(datafile, sizes.append) == 43313415
+    size_index = SizeIndex(sizes)
+    assert size_index.sum_under(100_000) == 1477771
+    assert size_index.smallest_at_least(3313415) == 3579501
+
+    tree = ArrayTree()
+    with open("2022/Day07/Day7Data.txt", "r") as datafile:
+        read_transcript(tree, datafile)
+    assert sorted(sizes) == sorted(tree.aggregate())
+
+    # Two constant memory passes, the first only to find the space to free
+    with open("2022/Day07/Day7Data.txt", "r") as datafile:
+        total_usage = stream_directory_sizes(datafile, lambda size: None)
+    sink = ThresholdSink(100_000, total_usage - (70_000_000 - 30_000_000))
+    with open("2022/Day07/Day7Data.txt", "r") as datafile:
+        stream_directory_sizes(datafile, sink)
+    assert sink.sum_under == 1477771
+    assert sink.smallest_at_least == 3579501
@@ -1,3 +1,11 @@
+import mmap
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
 from termcolor import colored
 
 """ Implement a class Tree with a list "self.visible" which contains "FROM_LEFT, "FROM_UP", etc. """
@@ -22,6 +30,7 @@ class Forest:
         self.origin = None
         self.previous_tree = None
         self.up_tree = None
+        self.row_start = None # First tree of the most recent row
 
     def add_tree_line(self, line: str):
         first_tree = True
@@ -31,6 +40,7 @@ class Forest:
                 new_tree = Tree(h)
                 if self.trees_completed == 0:
                     self.origin = new_tree
+                    self.row_start = new_tree
                 else:
                     new_tree.left = self.previous_tree
                     self.previous_tree.right = new_tree
@@ -39,14 +49,14 @@ class Forest:
 
         else:
             # Get up tree (follower tree in previous row)
-            up_tree = self.origin
-            for _ in range(self.lines_completed - 1):
-                up_tree = up_tree.down
+            up_tree = self.row_start
 
             # Begin adding trees
             for h in line:
                 new_tree = Tree(h)
-                if not first_tree:
+                if first_tree:
+                    self.row_start = new_tree
+                else:
                     new_tree.left = self.previous_tree
                     self.previous_tree.right = new_tree
                 up_tree.down = new_tree
@@ -216,23 +226,207 @@ class Forest:
 
         return (up_score * down_score * left_score * right_score)
 
+def load_heights(filename: str) -> np.ndarray:
+    """ The whole forest as a 2-D uint8 array of heights """
+    with open(filename, "rb") as datafile:
+        rows = datafile.read().split()
+    return (np.frombuffer(b"".join(rows), dtype=np.uint8) - ord("0")).reshape(len(rows), -1)
+
+def visible_from_left(heights: np.ndarray) -> np.ndarray:
+    """ A tree is visible from the left edge if it is taller than the running maximum before it """
+    tallest = np.maximum.accumulate(heights.astype(np.int16), axis=1)
+    tallest_before = np.full_like(tallest, -1)
+    tallest_before[:, 1:] = tallest[:, :-1]
+    return heights > tallest_before
+
+def visible_along_rows(heights: np.ndarray) -> np.ndarray:
+    """ Visible from the left or the right edge """
+    return visible_from_left(heights) | visible_from_left(heights[:, ::-1])[:, ::-1]
+
+def visible_mask(heights: np.ndarray) -> np.ndarray:
+    """ Visibility from all four edges, each one a flip or transpose of the view from the left """
+    return visible_along_rows(heights) | visible_along_rows(heights.T).T
+
+def count_visible(heights: np.ndarray) -> int:
+    return int(visible_mask(heights).sum())
+
+def stream_count_visible(filename: str) -> int:
+    """ Count visible trees without holding the forest in memory.  Rows are read from an mmap of the
+    file, and only per-column running maxima plus one row are kept.  The forward pass marks trees
+    visible from the top or left in a packed bitmap (a temporary file, one bit per tree), and the
+    backward pass walks the rows in reverse for the bottom and right, merging with the bitmap as it
+    counts.  Rows must all be the same width and end in \n or \r\n, anything else raises ValueError
+    rather than returning a wrong count """
+    if os.path.getsize(filename) == 0:
+        return 0
+    with open(filename, "rb") as datafile, mmap.mmap(datafile.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        width = buf.find(b"\n")
+        if width == -1:
+            width = len(buf)
+        line_ending = 1
+        if width > 0 and buf[width - 1:width] == b"\r":
+            width -= 1
+            line_ending = 2
+        stride = width + line_ending
+        rows, remainder = divmod(len(buf) + line_ending, stride)
+        if width == 0 or remainder not in (0, line_ending):
+            raise ValueError(f"{filename} does not have rows of equal width")
+
+        def read_row(row: int) -> np.ndarray:
+            heights = np.frombuffer(buf, dtype=np.uint8, count=width, offset=row * stride).astype(np.int16) - ord("0")
+            if heights.min() < 0 or heights.max() > 9:
+                raise ValueError(f"Row {row} of {filename} is not all digits")
+            return heights
+
+        def visible_in_row(heights: np.ndarray, tallest: np.ndarray) -> np.ndarray:
+            """ Visible past the running column maxima or along the row from the left """
+            visible = heights > tallest
+            np.maximum(tallest, heights, out=tallest)
+            tallest_before = np.empty_like(heights)
+            tallest_before[0] = -1
+            tallest_before[1:] = np.maximum.accumulate(heights)[:-1]
+            return visible | (heights > tallest_before)
+
+        with tempfile.TemporaryFile() as bitmap_file:
+            bitmap = np.memmap(bitmap_file, dtype=np.uint8, mode="w+", shape=(rows, (width + 7) // 8))
+            tallest = np.full(width, -1, dtype=np.int16)
+            for row in range(rows):
+                bitmap[row] = np.packbits(visible_in_row(read_row(row), tallest))
+
+            num_visible = 0
+            tallest = np.full(width, -1, dtype=np.int16)
+            for row in range(rows - 1, -1, -1):
+                visible = visible_in_row(read_row(row)[::-1], tallest[::-1])[::-1]
+                visible |= np.unpackbits(bitmap[row], count=width).astype(bool)
+                num_visible += int(visible.sum())
+            del bitmap
+    return num_visible
+
+def viewing_distance_from_left(heights: np.ndarray) -> np.ndarray:
+    """ How many trees each tree can see looking left, found in one sweep across the columns with
+    every row handled at once.  This is the monotonic stack of candidate blockers, kept for bounded
+    heights as the last column each height level (or taller) was seen in, so every tree costs
+    O(levels) no matter how far it can see """
+    rows, columns = heights.shape
+    if heights.size == 0:
+        return np.zeros(heights.shape, dtype=np.int64)
+    levels = np.arange(int(heights.max()) + 1)[:, np.newaxis]
+    blocker = np.zeros((len(levels), rows), dtype=np.int64) # Column 0 is the edge
+    row_ids = np.arange(rows)
+    distances = np.empty(heights.shape, dtype=np.int64)
+    for column in range(columns):
+        column_heights = heights[:, column]
+        distances[:, column] = column - blocker[column_heights, row_ids]
+        blocker = np.where(levels <= column_heights, column, blocker)
+    return distances
+
+def scores_along_rows(heights: np.ndarray) -> np.ndarray:
+    """ Product of the viewing distances to the left and to the right """
+    scores = viewing_distance_from_left(heights)
+    scores *= viewing_distance_from_left(heights[:, ::-1])[:, ::-1]
+    return scores
+
+def scenic_scores(heights: np.ndarray) -> np.ndarray:
+    """ Scenic score of every tree, the product of its viewing distances in all four directions """
+    scores = scores_along_rows(heights)
+    scores *= scores_along_rows(heights.T).T
+    return scores
+
+def best_scenic_score(heights: np.ndarray) -> int:
+    return int(scenic_scores(heights).max(initial=0))
+
+def share_array(shape: Tuple[int, ...], dtype, source: Optional[np.ndarray]=None) -> shared_memory.SharedMemory:
+    """ Shared memory block for a grid, optionally filled from source.  The caller unlinks it """
+    block = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize))
+    if source is not None:
+        np.ndarray(shape, dtype=dtype, buffer=block.buf)[:] = source
+    return block
+
+def row_band_worker(task: tuple):
+    """ Process pool worker, one band of rows: left/right visibility or scores into the shared output """
+    heights_name, output_name, shape, output_dtype, start, stop = task
+    heights_block = shared_memory.SharedMemory(name=heights_name)
+    output_block = shared_memory.SharedMemory(name=output_name)
+    try:
+        heights = np.ndarray(shape, dtype=np.uint8, buffer=heights_block.buf)
+        output = np.ndarray(shape, dtype=output_dtype, buffer=output_block.buf)
+        if output.dtype == np.bool_:
+            output[start:stop] = visible_along_rows(heights[start:stop])
+        else:
+            output[start:stop] = scores_along_rows(heights[start:stop])
+        del heights, output
+    finally:
+        heights_block.close()
+        output_block.close()
+
+def column_band_worker(task: tuple) -> int:
+    """ Process pool worker, one band of columns: merge in up/down and return the band's visible
+    count or best score """
+    heights_name, output_name, shape, output_dtype, start, stop = task
+    heights_block = shared_memory.SharedMemory(name=heights_name)
+    output_block = shared_memory.SharedMemory(name=output_name)
+    try:
+        band = np.ndarray(shape, dtype=np.uint8, buffer=heights_block.buf)[:, start:stop].T
+        output = np.ndarray(shape, dtype=output_dtype, buffer=output_block.buf)[:, start:stop].T
+        if output.dtype == np.bool_:
+            result = int((output | visible_along_rows(band)).sum())
+        else:
+            result = int((output * scores_along_rows(band)).max(initial=0))
+        del band, output
+        return result
+    finally:
+        heights_block.close()
+        output_block.close()
+
+def parallel_band_reduce(heights: np.ndarray, output_dtype, workers: Optional[int]=None,
+                         bands: Optional[int]=None) -> list:
+    """ Copy the grid into shared memory once, run row bands then column bands over it in a
+    process pool, and return the per column band results """
+    workers = workers or os.cpu_count() or 1
+    bands = bands or workers
+    rows, columns = heights.shape
+    heights_block = share_array(heights.shape, np.uint8, heights)
+    output_block = share_array(heights.shape, output_dtype)
+    try:
+        def tasks(length: int) -> list:
+            edges = np.linspace(0, length, min(bands, max(length, 1)) + 1, dtype=int)
+            return [(heights_block.name, output_block.name, heights.shape, output_dtype, int(start), int(stop))
+                    for start, stop in zip(edges, edges[1:])]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(row_band_worker, tasks(rows)))
+            return list(pool.map(column_band_worker, tasks(columns)))
+    finally:
+        heights_block.close()
+        heights_block.unlink()
+        output_block.close()
+        output_block.unlink()
 
-    
+def parallel_count_visible(heights: np.ndarray, workers: Optional[int]=None, bands: Optional[int]=None) -> int:
+    return sum(parallel_band_reduce(heights, np.bool_, workers, bands))
 
+def parallel_best_scenic_score(heights: np.ndarray, workers: Optional[int]=None, bands: Optional[int]=None) -> int:
+    return max(parallel_band_reduce(heights, np.int64, workers, bands), default=0)
 
 
+if __name__ == "__main__":
+    print("Part 1: How many trees are visible from outside the grid?")
+    forest = Forest()
+    with open("Day8Data.txt", "r") as datafile:
+        for line in datafile:
+            forest.add_tree_line(line.strip())
 
-print("Part 1: How many trees are visible from outside the grid?")
-forest = Forest()
-with open("Day8Data.txt", "r") as datafile:
-    for line in datafile:
-        forest.add_tree_line(line.strip())
+    num_visible = forest.calculate_visible()
+    forest.render()
+    print(num_visible)
 
-num_visible = forest.calculate_visible()
-forest.render()
-print(num_visible)
 
+    print("Part 2: What is the highest scenic score possible for any tree?")
+    max_score = forest.find_best_treehouse_naive()
+    print(max_score)
 
-print("Part 2: What is the highest scenic score possible for any tree?")
-max_score = forest.find_best_treehouse_naive()
-print(max_score)
+    heights = load_heights("Day8Data.txt")
+    print("Part 1 from the height grid:")
+    print(count_visible(heights))
+    print("Part 2 from the height grid:")
+    print(best_scenic_score(heights))
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from Day08.Day8 import Forest, load_heights, visible_mask, count_visible, scenic_scores, best_scenic_score, \
+    stream_count_visible, parallel_count_visible, parallel_best_scenic_score
+
+def load_forest(filename: str) -> Forest:
+    forest = Forest()
+    with open(filename, "r") as datafile:
+        for line in datafile:
+            forest.add_tree_line(line.strip())
+    return forest
+
+def test_part_1():
+    print()
+    print("Part 1: How many trees are visible from outside the grid?")
+    heights = load_heights("2022/Day08/Day8Data.txt")
+    assert heights.shape == (99, 99)
+    assert heights.dtype == np.uint8
+    print(count_visible(heights))
+    assert count_visible(heights) == 1820
+
+def test_part_2():
+    print()
+    print("Part 2: What is the highest scenic score possible for any tree?")
+    heights = load_heights("2022/Day08/Day8Data.txt")
+    print(best_scenic_score(heights))
+    assert best_scenic_score(heights) == 385112
+
+def test_linked_forest():
+    forest = load_forest("2022/Day08/Day8Data.txt")
+    assert forest.calculate_visible() == 1820
+    assert forest.find_best_treehouse_naive() == 385112
+
+def test_visible_example():
+    heights = np.array([[3, 0, 3, 7, 3],
+                        [2, 5, 5, 1, 2],
+                        [6, 5, 3, 3, 2],
+                        [3, 3, 5, 4, 9],
+                        [3, 5, 3, 9, 0]], dtype=np.uint8)
+    assert count_visible(heights) == 21
+    assert not visible_mask(heights)[1, 3]
+    assert visible_mask(heights)[1, 1]
+
+def test_scenic_scores_match_naive():
+    forest = load_forest("2022/Day08/Day8Data.txt")
+    scores = scenic_scores(load_heights("2022/Day08/Day8Data.txt"))
+    row_start = forest.origin
+    for row in range(scores.shape[0]):
+        tree = row_start
+        for column in range(scores.shape[1]):
+            assert scores[row, column] == forest.score_tree(tree)
+            tree = tree.right
+        row_start = row_start.down
+
+    heights = np.array([[3, 0, 3, 7, 3],
+                        [2, 5, 5, 1, 2],
+                        [6, 5, 3, 3, 2],
+                        [3, 3, 5, 4, 9],
+                        [3, 5, 3, 9, 0]], dtype=np.uint8)
+    assert scenic_scores(heights)[3, 2] == 8
+    assert best_scenic_score(heights) == 8
+
+def test_streaming_visibility(tmp_path):
+    assert stream_count_visible("2022/Day08/Day8Data.txt") == 1820
+
+    heights = np.random.default_rng(8).integers(0, 10, size=(37, 53), dtype=np.uint8)
+    forest_file = tmp_path / "forest.txt"
+    forest_file.write_text("\n".join("".join(str(h) for h in row) for row in heights) + "\n")
+    assert stream_count_visible(str(forest_file)) == count_visible(heights)
+
+def test_streaming_visibility_line_endings(tmp_path):
+    with open("2022/Day08/Day8Data.txt", "rb") as datafile:
+        forest = datafile.read()
+    crlf_file = tmp_path / "crlf.txt"
+    for data in [forest.replace(b"\n", b"\r\n"), forest.replace(b"\n", b"\r\n") + b"\r\n"]:
+        crlf_file.write_bytes(data)
+        assert stream_count_visible(str(crlf_file)) == 1820
+
+    ragged_file = tmp_path / "ragged.txt"
+    for data in [b"123\n45\n678\n", b"123\n4x6\n789\n"]:
+        ragged_file.write_bytes(data)
+        with pytest.raises(ValueError):
+            stream_count_visible(str(ragged_file))
+
+def test_parallel_bands():
+    heights = load_heights("2022/Day08/Day8Data.txt")
+    assert parallel_count_visible(heights, workers=2, bands=3) == 1820
+    assert parallel_best_scenic_score(heights, workers=2, bands=5) == 385112
+
+    heights = np.random.default_rng(23).integers(0, 10, size=(41, 29), dtype=np.uint8)
+    assert parallel_count_visible(heights, workers=2, bands=50) == count_visible(heights)
+    assert parallel_best_scenic_score(heights, workers=2, bands=4) == best_scenic_score(heights)
@@ -1,3 +1,8 @@
+from array import array
+from itertools import repeat
+from typing import Iterable, List, Optional, Set, Tuple
+
+DIRECTIONS = {"L": (-1, 0), "R": (1, 0), "D": (0, -1), "U": (0, 1)}
 
 class Ropes:
     def __init__(self, num_knots):
@@ -65,3 +70,80 @@ class Rope:
                 self.T = (self.T[0] + (1 if ((self.H[0] - self.T[0]) > 0) else -1), self.T[1])
                 
         self.tail_map.add((self.T))
+
+
+class KnotRope:
+    """ N-knot rope with every knot's position in flat x and y arrays.  A step stops propagating at
+    the first knot that doesn't move, and visited cells are only recorded for the knots in track
+    (by default just the last one), so long ropes and long move files stay practical """
+    def __init__(self, num_knots: int, track: Iterable[int]=(-1,)):
+        if num_knots < 1:
+            raise ValueError(f"A rope needs at least one knot, got {num_knots}")
+        self.num_knots = num_knots
+        self.x = array("q", [0] * num_knots)
+        self.y = array("q", [0] * num_knots)
+        self.visited: List[Optional[Set[Tuple[int, int]]]] = [None] * num_knots
+        for knot in track:
+            self.visited[knot] = {(0, 0)}
+
+    def get_visited(self, knot: int=-1) -> Set[Tuple[int, int]]:
+        if self.visited[knot] is None:
+            raise ValueError(f"Knot {knot} is not being tracked")
+        return self.visited[knot]
+
+    def move(self, direction: str) -> bool:
+        """ Step the head one cell, returns whether the movement reached the last knot """
+        dx, dy = DIRECTIONS[direction.upper()]
+        x = self.x
+        y = self.y
+        x[0] += dx
+        y[0] += dy
+        if self.visited[0] is not None:
+            self.visited[0].add((x[0], y[0]))
+        for knot in range(1, self.num_knots):
+            dx = x[knot - 1] - x[knot]
+            dy = y[knot - 1] - y[knot]
+            if -1 <= dx <= 1 and -1 <= dy <= 1:
+                return False # Still touching, so no knot further down the rope moves either
+            x[knot] += (dx > 0) - (dx < 0)
+            y[knot] += (dy > 0) - (dy < 0)
+            if self.visited[knot] is not None:
+                self.visited[knot].add((x[knot], y[knot]))
+        return True
+
+    def is_straight(self, dx: int, dy: int) -> bool:
+        """ Is every knot directly behind the one ahead of it, heading along (dx, dy) """
+        for knot in range(1, self.num_knots):
+            if self.x[knot - 1] - self.x[knot] != dx or self.y[knot - 1] - self.y[knot] != dy:
+                return False
+        return True
+
+    def slide(self, dx: int, dy: int, steps: int):
+        """ Move a straight rope steps cells along (dx, dy) in one go.  Every knot follows the same
+        line segment, so tracked knots add the whole segment at once """
+        for knot in range(self.num_knots):
+            x = self.x[knot]
+            y = self.y[knot]
+            if self.visited[knot] is not None:
+                if dx:
+                    cells = zip(range(x + dx, x + dx * (steps + 1), dx), repeat(y))
+                else:
+                    cells = zip(repeat(x), range(y + dy, y + dy * (steps + 1), dy))
+                self.visited[knot].update(cells)
+            self.x[knot] = x + dx * steps
+            self.y[knot] = y + dy * steps
+
+    def run(self, direction: str, steps: int):
+        """ Step only until the rope lines up behind the head, then slide the rest of the run.  A
+        sliding rope moves every knot, so straightness is only checked after steps that do """
+        dx, dy = DIRECTIONS[direction.upper()]
+        tail_moved = True
+        while steps > 0 and not (tail_moved and self.is_straight(dx, dy)):
+            tail_moved = self.move(direction)
+            steps -= 1
+        if steps > 0:
+            self.slide(dx, dy, steps)
+
+    def multi_move(self, move: str):
+        direction, steps = move.split()
+        self.run(direction, int(steps))
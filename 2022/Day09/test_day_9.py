@@ -1,4 +1,4 @@
-from Day09.Day9 import Rope, Ropes
+from Day09.Day9 import Rope, Ropes, KnotRope
 
 def test_part_1():
     print()
@@ -20,4 +20,43 @@ def test_part_2():
             rope.multi_move(line.strip())
 
     print(len(rope.ropes[8].tail_map))
-    assert len(rope.ropes[8].tail_map) == 2533
\ No newline at end of file
+    assert len(rope.ropes[8].tail_map) == 2533
+
+def test_knot_rope():
+    short_rope = KnotRope(2)
+    long_rope = KnotRope(10, track=(1, -1))
+    with open("2022/Day09/Day9Data.txt", "r") as datafile:
+        for line in datafile:
+            short_rope.multi_move(line.strip())
+            long_rope.multi_move(line.strip())
+
+    assert len(short_rope.get_visited()) == 6023
+    assert long_rope.get_visited(1) == short_rope.get_visited()
+    assert len(long_rope.get_visited()) == 2533
+
+def test_knot_rope_example():
+    rope = KnotRope(10)
+    for move in ["R 5", "U 8", "L 8", "D 3", "R 17", "D 10", "L 25", "U 20"]:
+        rope.multi_move(move)
+    assert len(rope.get_visited()) == 36
+    assert (rope.x[0], rope.y[0]) == (-11, 15)
+
+def test_segment_runs():
+    moves = ["R 40", "U 3", "L 7", "D 25", "R 1", "U 1", "L 60", "D 2", "R 2", "U 90"]
+    for num_knots in [1, 2, 10, 30]:
+        segmented = KnotRope(num_knots, track=range(num_knots))
+        stepped = KnotRope(num_knots, track=range(num_knots))
+        for move in moves:
+            segmented.multi_move(move)
+            direction, steps = move.split()
+            for _ in range(int(steps)):
+                stepped.move(direction)
+            assert segmented.x == stepped.x
+            assert segmented.y == stepped.y
+        assert segmented.visited == stepped.visited
+
+    rope = KnotRope(1000)
+    rope.multi_move("R 200000")
+    rope.multi_move("U 200000")
+    assert (rope.x[-1], rope.y[-1]) == (200000, 200000 - 999)
+    assert len(rope.get_visited()) == 2 * 200000 - 2 * 999 + 1